@@ -1,5 +1,9 @@
 # Configuration file for Plant Monitor
 # COPY THIS FILE TO config.py AND UPDATE WITH YOUR ACTUAL VALUES
+# Integer settings use const() so MicroPython can fold them into the bytecode.
+# Optionally precompile with `mpy-cross -O3 config.py` and upload config.mpy.
+
+from micropython import const
 
 # WiFi Configuration
 WIFI_SSID = "your_wifi_name"
@@ -7,25 +11,28 @@ WIFI_PASSWORD = "your_wifi_password"
 
 # MQTT Broker Configuration
 MQTT_BROKER = "192.168.1.100"  # IP address of your MQTT broker
-MQTT_PORT = 1883 
+MQTT_PORT = const(1883) 
 MQTT_USERNAME = "your_mqtt_username"
 MQTT_PASSWORD = "your_mqtt_password"
 MQTT_CLIENT_ID = "pico_w_sensor_01"
 
 # Sensor Configuration
-SENSOR_READ_INTERVAL = 6    # seconds between individual sensor reads
-PUBLISH_INTERVAL = 60       # seconds between publishing averaged data
-STATUS_UPDATE_INTERVAL = 300  # seconds between status updates
+SENSOR_READ_INTERVAL = const(6)    # seconds between individual sensor reads
+PUBLISH_INTERVAL = const(60)       # seconds between publishing averaged data
+STATUS_UPDATE_INTERVAL = const(300)  # seconds between status updates
 
 # Soil Moisture Calibration (adjust these values for your sensor)
-SOIL_MOISTURE_DRY = 41000   # ADC value for completely dry soil
-SOIL_MOISTURE_WET = 18000   # ADC value for completely wet soil
+SOIL_MOISTURE_DRY = const(41000)   # ADC value for completely dry soil
+SOIL_MOISTURE_WET = const(18000)   # ADC value for completely wet soil
 
 # GPIO Pin Configuration
-PIN_DHT11 = 22              # DHT11 data pin
-PIN_I2C_SCL = 5            # I2C clock pin for BH1750 and OLED
-PIN_I2C_SDA = 4            # I2C data pin for BH1750 and OLED
-PIN_SOIL_MOISTURE = 26     # ADC pin for soil moisture sensor
+PIN_DHT11 = const(22)              # DHT11 data pin
+PIN_I2C_SCL = const(5)            # I2C clock pin for BH1750 and OLED
+PIN_I2C_SDA = const(4)            # I2C data pin for BH1750 and OLED
+PIN_SOIL_MOISTURE = const(26)     # ADC pin for soil moisture sensor
+
+# Logging
+DEBUG = const(True)  # print log messages over serial; set to False in production
 
 # Device Information
 DEVICE_NAME = "Pico W Plant Sensor"
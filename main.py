@@ -27,15 +27,16 @@ Course: 1DT305 IoT Summer Course, Linnaeus University
 Year: 2025
 """
 
-from machine import Pin, SoftI2C, ADC
-import dht
-from bh1750 import BH1750
-import ssd1306
+from machine import Pin, I2C, ADC, lightsleep
+import sys
 import time
+import random
 import network
-from umqtt.robust import MQTTClient
+from umqtt.simple import MQTTClient
 import json
 import gc
+import micropython
+from micropython import const
 
 # Import configuration
 try:
@@ -45,6 +46,10 @@ except ImportError:
     print("See README.md for configuration instructions.")
     raise
 
+# Debug logging defaults to on for configs that predate the DEBUG setting
+if "DEBUG" not in globals():
+    DEBUG = True
+
 # Use configuration values
 ssid = WIFI_SSID
 password = WIFI_PASSWORD
@@ -54,9 +59,34 @@ mqtt_user = MQTT_USERNAME
 mqtt_password = MQTT_PASSWORD
 client_id = MQTT_CLIENT_ID
 
-PUBLISH_INTERVAL = PUBLISH_INTERVAL
-SENSOR_READ_INTERVAL = SENSOR_READ_INTERVAL
-STATUS_UPDATE_INTERVAL = STATUS_UPDATE_INTERVAL
+# Reconnection backoff: 5s -> 10s -> 20s -> 40s -> 60s cap, plus up to 25% jitter
+BACKOFF_BASE = const(5)  # seconds before the first retry
+BACKOFF_MAX = const(60)  # upper bound for the retry delay in seconds
+BACKOFF_MAX_FAILURES = const(6)  # failure that triggers light sleep, after 60s
+BACKOFF_SLEEP_MS = const(15 * 60 * 1000)  # light sleep duration after too many failures
+WIFI_CONNECT_TIMEOUT = const(10)  # seconds to wait for association per attempt
+MQTT_PING_ATTEMPTS = const(2)  # pings to try before declaring the broker dead
+MQTT_PING_RETRY_DELAY = const(2)  # seconds between ping attempts
+MQTT_IDLE_PING_AFTER_MS = const(60_000)  # skip pings if we sent something since
+CONNECTION_CHECK_INTERVAL_MS = const(60_000)  # time between connection checks
+GC_INTERVAL_MS = const(300_000)  # time between forced garbage collections
+PUBLISH_TIMEOUT_MS = const(300_000)  # report "Publish Timeout" after this long
+
+# Loop intervals in milliseconds, for use with time.ticks_ms()/ticks_diff()
+SENSOR_READ_INTERVAL_MS = SENSOR_READ_INTERVAL * 1000
+PUBLISH_INTERVAL_MS = PUBLISH_INTERVAL * 1000
+STATUS_UPDATE_INTERVAL_MS = STATUS_UPDATE_INTERVAL * 1000
+
+# Adaptive sampling: readings that change less than the noise floor back off
+# the sensor's read interval, never beyond half a publish interval so every
+# average still gets samples
+NOISE_FLOOR_TEMPERATURE = const(1)  # degrees Celsius (DHT11 accuracy)
+NOISE_FLOOR_HUMIDITY = const(5)  # percent (DHT11 accuracy)
+NOISE_FLOOR_LUX = const(2)  # lux
+NOISE_FLOOR_SOIL_MOISTURE = const(2)  # percent
+ADAPTIVE_MAX_INTERVAL_MS = min(60_000, PUBLISH_INTERVAL_MS // 2)
+LIGHTSLEEP_MIN_MS = const(5000)  # only light sleep for waits at least this long
+MIN_SLEEP_MS = const(10)  # shortest pause between main loop iterations
 
 # Global variables for sensors
 oled = None
@@ -65,95 +95,290 @@ dht_sensor = None
 soil_moisture_adc = None
 wlan = None
 mqtt_client = None
+i2c = None
+_last_oled = None  # values currently shown on the OLED
+_oled_template = None  # framebuffer with only the static labels drawn
+
+# OLED rows as (label, y), in the order update_oled formats the values; each
+# value is drawn right after its label (8px per character)
+_OLED_LABELS = (("Lux: ", 0), ("Temp: ", 16), ("Humidity: ", 32), ("Moisture: ", 48))
 
 # Status tracking variables
 sensor_status = {"dht11": False, "bh1750": False, "soil_moisture": False, "oled": False}
 failed_sensor_reads = {"dht11": 0, "bh1750": 0, "soil_moisture": 0}
-connection_status = {"wifi": False, "mqtt": False, "last_successful_publish": 0}
+connection_status = {
+    "wifi": False,
+    "mqtt": False,
+    "last_successful_publish": None,  # ticks_ms of the last sensor publish
+    "last_mqtt_send": 0,  # ticks_ms of the last packet sent to the broker
+}
+_last_reading = {
+    "temperature": None,
+    "humidity": None,
+    "lux": None,
+    "soil_moisture": None,
+}
+_stable_count = {"dht11": 0, "bh1750": 0, "soil_moisture": 0}
+_skip_until_ms = {"dht11": 0, "bh1750": 0, "soil_moisture": 0}
+_wifi_backoff = {"attempts": 0, "next_attempt_ms": 0}
+_mqtt_backoff = {"attempts": 0, "next_attempt_ms": 0}
+
+# MQTT topics, built once as bytes so publishing needs no formatting or encoding.
+# All sensor readings share one JSON state topic; status and test have their own.
+_TOPIC_BASE = "homeassistant/sensor/pico_w_01/"
+_SENSOR_STATE_TOPIC = _TOPIC_BASE + "state"
+_TOPIC_IDS = ("temperature", "humidity", "lux", "soil_moisture", "status")
+_STATE_TOPICS = {k: (_TOPIC_BASE + k + "/state").encode() for k in ("status", "test")}
+_STATE_TOPICS["sensors"] = _SENSOR_STATE_TOPIC.encode()
+_CONFIG_TOPICS = {k: (_TOPIC_BASE + k + "/config").encode() for k in _TOPIC_IDS}
+
+
+def unload_module(name):
+    """
+    Drop an imported driver module that turned out to be unused.
 
+    Removes the module from sys.modules and collects garbage so a driver
+    for hardware that failed to initialize does not keep holding RAM.
 
-def initialize_sensors():
+    Args:
+        name (str): Module name as used in the import statement
+
+    Returns:
+        None
     """
-    Initialize all sensors and update their status.
+    sys.modules.pop(name, None)
+    gc.collect()
+
 
-    Sets up I2C communication for BH1750 light sensor and OLED display,
-    initializes DHT11 temperature/humidity sensor, and configures ADC for
-    soil moisture readings. Updates global sensor_status dictionary to track
-    which sensors are working properly.
+def init_i2c():
+    """
+    Set up the shared hardware I2C bus for the BH1750 light sensor and OLED
+    display.
 
     Returns:
-        None
+        bool: True if the bus was created, False otherwise
+    """
+    global i2c
+    if DEBUG:
+        print("Initializing I2C...")
+    try:
+        # RP2040 pins alternate between I2C0 and I2C1 in pairs (GPIO4/5 -> I2C0)
+        i2c = I2C(
+            (PIN_I2C_SDA // 2) % 2,
+            scl=Pin(PIN_I2C_SCL),
+            sda=Pin(PIN_I2C_SDA),
+            freq=400_000,
+        )
+    except Exception as e:
+        if DEBUG:
+            print("I2C initialization failed:", e)
+        i2c = None
+        return False
+    time.sleep_ms(50)  # Let the bus settle before talking to devices
+    if DEBUG:
+        print("I2C devices found:", [hex(addr) for addr in i2c.scan()])
+    return True
+
+
+def init_oled():
     """
-    global oled, light_sensor, dht_sensor, soil_moisture_adc, i2c
+    Initialize the SSD1306 OLED display and show a startup message.
 
-    # Initialize I2C
-    print("Initializing I2C...")
-    i2c = SoftI2C(scl=Pin(PIN_I2C_SCL), sda=Pin(PIN_I2C_SDA), freq=400000)
-    print("I2C devices found:", [hex(addr) for addr in i2c.scan()])
+    Also renders the fixed row labels once into _oled_template, so
+    update_oled only has to draw the values. The driver module is imported
+    lazily and unloaded again if the display fails to initialize. Updates
+    sensor_status["oled"].
 
-    # OLED setup
-    print("Setting up OLED...")
+    Returns:
+        bool: True if the display is working, False otherwise
+    """
+    global oled, _oled_template
+    if DEBUG:
+        print("Setting up OLED...")
     try:
+        import ssd1306
+
         oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+        oled.fill(0)
+        for label, y in _OLED_LABELS:
+            oled.text(label, 0, y)
+        _oled_template = bytes(oled.buffer)
+
         oled.fill(0)
         oled.text("Starting...", 0, 0)
         oled.show()
-        print("OLED initialized successfully")
+        if DEBUG:
+            print("OLED initialized successfully")
         sensor_status["oled"] = True
     except Exception as e:
-        print("OLED initialization failed:", e)
+        if DEBUG:
+            print("OLED initialization failed:", e)
         oled = None
         sensor_status["oled"] = False
-    time.sleep(1)
+        ssd1306 = None  # Drop our reference so the module can be collected
+        unload_module("ssd1306")
+    return sensor_status["oled"]
 
-    # BH1750 setup
-    print("Setting up BH1750...")
+
+def init_bh1750():
+    """
+    Initialize the BH1750 light sensor and take a test reading.
+
+    The driver module is imported lazily and unloaded again if the sensor
+    fails to initialize. Updates sensor_status["bh1750"].
+
+    Returns:
+        bool: True if the sensor is working, False otherwise
+    """
+    global light_sensor
+    if DEBUG:
+        print("Setting up BH1750...")
     try:
+        from bh1750 import BH1750
+
         light_sensor = BH1750(bus=i2c, addr=0x23)
         test_lux = light_sensor.luminance(BH1750.CONT_HIRES_1)
-        print("BH1750 initialized successfully, test reading:", test_lux)
+        if DEBUG:
+            print("BH1750 initialized successfully, test reading:", test_lux)
         sensor_status["bh1750"] = True
     except Exception as e:
-        print("BH1750 initialization failed:", e)
+        if DEBUG:
+            print("BH1750 initialization failed:", e)
         light_sensor = None
         sensor_status["bh1750"] = False
-    time.sleep(1)
+        BH1750 = None  # Drop our reference so the module can be collected
+        unload_module("bh1750")
+    return sensor_status["bh1750"]
 
-    # DHT11 setup
-    print("Setting up DHT11...")
+
+def init_dht11():
+    """
+    Initialize the DHT11 temperature/humidity sensor.
+
+    Updates sensor_status["dht11"].
+
+    Returns:
+        bool: True if the sensor is working, False otherwise
+    """
+    global dht_sensor
+    if DEBUG:
+        print("Setting up DHT11...")
     try:
+        import dht
+
         dht_sensor = dht.DHT11(Pin(PIN_DHT11))
-        print("DHT11 initialized successfully")
+        if DEBUG:
+            print("DHT11 initialized successfully")
         sensor_status["dht11"] = True
     except Exception as e:
-        print("DHT11 initialization failed:", e)
+        if DEBUG:
+            print("DHT11 initialization failed:", e)
         dht_sensor = None
         sensor_status["dht11"] = False
-    time.sleep(1)
+    return sensor_status["dht11"]
 
-    # Soil moisture setup
-    print("Setting up soil moisture sensor...")
+
+def init_soil_moisture():
+    """
+    Configure the ADC for soil moisture readings and take a test reading.
+
+    Updates sensor_status["soil_moisture"].
+
+    Returns:
+        bool: True if the sensor is working, False otherwise
+    """
+    global soil_moisture_adc
+    if DEBUG:
+        print("Setting up soil moisture sensor...")
     try:
         soil_moisture_adc = ADC(PIN_SOIL_MOISTURE)
         test_moisture = soil_moisture_adc.read_u16()
-        print(
-            "Soil moisture sensor initialized successfully, test reading:",
-            test_moisture,
-        )
+        if DEBUG:
+            print(
+                "Soil moisture sensor initialized successfully, test reading:",
+                test_moisture,
+            )
         sensor_status["soil_moisture"] = True
     except Exception as e:
-        print("Soil moisture initialization failed:", e)
+        if DEBUG:
+            print("Soil moisture initialization failed:", e)
         soil_moisture_adc = None
         sensor_status["soil_moisture"] = False
-    time.sleep(1)
+    return sensor_status["soil_moisture"]
+
+
+def backoff_ready(state):
+    """
+    Check whether a reconnection backoff window has elapsed.
+
+    Args:
+        state (dict): Backoff state (_wifi_backoff or _mqtt_backoff)
+
+    Returns:
+        bool: True if the next connection attempt may be made now
+    """
+    return (
+        state["attempts"] == 0
+        or time.ticks_diff(time.ticks_ms(), state["next_attempt_ms"]) >= 0
+    )
+
+
+def backoff_reset(state):
+    """
+    Reset a backoff state after a successful connection.
+
+    Args:
+        state (dict): Backoff state (_wifi_backoff or _mqtt_backoff)
+
+    Returns:
+        None
+    """
+    state["attempts"] = 0
+    state["next_attempt_ms"] = 0
+
+
+def backoff_failure(state, name):
+    """
+    Record a failed connection attempt and schedule the next one.
+
+    Uses truncated binary exponential backoff with uniform jitter so that
+    retries are spread out instead of hammering the access point or broker.
+    After BACKOFF_MAX_FAILURES consecutive failures the board is put into
+    light sleep for BACKOFF_SLEEP_MS to save power, then retries immediately.
+
+    Args:
+        state (dict): Backoff state (_wifi_backoff or _mqtt_backoff)
+        name (str): Connection name used in log messages
+
+    Returns:
+        None
+    """
+    state["attempts"] += 1
+    if state["attempts"] >= BACKOFF_MAX_FAILURES:
+        if DEBUG:
+            print(
+                f"{name} failed {state['attempts']} times, "
+                f"sleeping for {BACKOFF_SLEEP_MS // 1000}s"
+            )
+        lightsleep(BACKOFF_SLEEP_MS)
+        backoff_reset(state)
+        return
+
+    delay = min(BACKOFF_BASE * 2 ** (state["attempts"] - 1), BACKOFF_MAX)
+    delay += random.uniform(0, delay * 0.25)
+    state["next_attempt_ms"] = time.ticks_add(time.ticks_ms(), int(delay * 1000))
+    if DEBUG:
+        print(f"{name} retry {state['attempts']} scheduled in {delay:.1f}s")
 
 
 def connect_wifi():
     """
-    Establish WiFi connection with automatic retry mechanism.
+    Make a single WiFi connection attempt.
 
-    Attempts to connect to WiFi network using global ssid and password.
-    Retries up to 10 times with 2-second delays between attempts.
+    Attempts to connect to WiFi network using global ssid and password,
+    waiting up to WIFI_CONNECT_TIMEOUT seconds for association. Instead of
+    retrying internally, failures are recorded in _wifi_backoff so the main
+    loop can schedule the next attempt with exponential backoff.
     Updates connection_status dictionary with WiFi status.
 
     Returns:
@@ -161,27 +386,32 @@ def connect_wifi():
     """
     global wlan
     if wlan is None:
-        print("Setting up WiFi...")
+        if DEBUG:
+            print("Setting up WiFi...")
         wlan = network.WLAN(network.STA_IF)
 
     wlan.active(True)
     if not wlan.isconnected():
-        print("Connecting to WiFi...")
+        if DEBUG:
+            print(f"Connecting to WiFi (attempt {_wifi_backoff['attempts'] + 1})...")
         wlan.connect(ssid, password)
-        attempt = 0
-        while not wlan.isconnected() and attempt < 10:
-            time.sleep(2)
-            attempt += 1
-            print(f"WiFi connection attempt {attempt}/10")
+        waited = 0
+        while not wlan.isconnected() and waited < WIFI_CONNECT_TIMEOUT:
+            time.sleep(1)
+            waited += 1
 
     connected = wlan.isconnected()
     connection_status["wifi"] = connected
 
     if connected:
-        print("Connected to WiFi:", wlan.ifconfig())
+        if DEBUG:
+            print("Connected to WiFi:", wlan.ifconfig())
+        backoff_reset(_wifi_backoff)
         return True
     else:
-        print("Failed to connect to WiFi")
+        if DEBUG:
+            print("Failed to connect to WiFi")
+        backoff_failure(_wifi_backoff, "WiFi")
         return False
 
 
@@ -189,47 +419,91 @@ def connect_mqtt():
     """
     Establish MQTT connection to broker with authentication.
 
-    Creates MQTTClient instance with global broker credentials and connects
+    Creates the long-lived MQTTClient instance on first use and connects it
     to the MQTT broker. Includes connection testing by publishing a test message.
-    Handles cleanup of existing connections and error management.
+    Failures are recorded in _mqtt_backoff so retries back off exponentially.
 
     Returns:
         bool: True if connection successful, False otherwise
     """
     global mqtt_client
     try:
-        if mqtt_client is not None:
-            try:
-                mqtt_client.disconnect()
-            except:
-                pass
-        print(f"Attempting MQTT connection to {mqtt_broker}:{mqtt_port}")
-        mqtt_client = MQTTClient(
-            client_id,
-            mqtt_broker,
-            port=mqtt_port,
-            user=mqtt_user,
-            password=mqtt_password,
-            keepalive=120,
-        )
+        if mqtt_client is None:
+            mqtt_client = MQTTClient(
+                client_id,
+                mqtt_broker,
+                port=mqtt_port,
+                user=mqtt_user,
+                password=mqtt_password,
+                keepalive=120,
+            )
+        if DEBUG:
+            print(f"Attempting MQTT connection to {mqtt_broker}:{mqtt_port}")
 
         mqtt_client.connect()
-        print("Connected to MQTT broker")
+        if DEBUG:
+            print("Connected to MQTT broker")
         connection_status["mqtt"] = True
 
         # Test the connection with a simple publish
-        test_topic = f"homeassistant/sensor/pico_w_01/test/state"
-        mqtt_client.publish(test_topic, "connected")
-        print("MQTT connection test successful")
+        mqtt_client.publish(_STATE_TOPICS["test"], b"connected")
+        connection_status["last_mqtt_send"] = time.ticks_ms()
+        if DEBUG:
+            print("MQTT connection test successful")
+        backoff_reset(_mqtt_backoff)
         return True
 
     except Exception as e:
-        print("MQTT connection failed:", e)
-        mqtt_client = None
+        if DEBUG:
+            print("MQTT connection failed:", e)
         connection_status["mqtt"] = False
+        backoff_failure(_mqtt_backoff, "MQTT")
         return False
 
 
+def reconnect_mqtt():
+    """
+    Re-establish the MQTT connection on the existing client.
+
+    Only called once the old socket is known to be dead, so no DISCONNECT
+    packet is sent; the stale socket is just closed to release it before
+    connect_mqtt opens a new one.
+
+    Returns:
+        bool: True if connection successful, False otherwise
+    """
+    if mqtt_client is not None and mqtt_client.sock is not None:
+        try:
+            mqtt_client.sock.close()
+        except:
+            pass
+    return connect_mqtt()
+
+
+def ping_mqtt():
+    """
+    Check that the MQTT connection is still alive.
+
+    Sends up to MQTT_PING_ATTEMPTS pings, MQTT_PING_RETRY_DELAY seconds
+    apart, so a single transient failure does not force a reconnect and
+    discovery republish.
+
+    Returns:
+        bool: True if a ping was sent successfully, False otherwise
+    """
+    for attempt in range(MQTT_PING_ATTEMPTS):
+        try:
+            mqtt_client.ping()
+            connection_status["last_mqtt_send"] = time.ticks_ms()
+            return True
+        except Exception as e:
+            if DEBUG:
+                print(f"MQTT ping {attempt + 1}/{MQTT_PING_ATTEMPTS} failed: {e}")
+            if attempt + 1 < MQTT_PING_ATTEMPTS:
+                time.sleep(MQTT_PING_RETRY_DELAY)
+    return False
+
+
 def is_mqtt_connected():
     """
     Check if MQTT client is currently connected.
@@ -243,23 +517,19 @@ def is_mqtt_connected():
     return mqtt_client is not None and connection_status["mqtt"]
 
 
-def publish_discovery_config():
+def _build_discovery_payloads():
     """
-    Publish Home Assistant discovery configurations for all sensors.
+    Build Home Assistant discovery configurations for all sensors.
 
-    Publishes MQTT discovery configurations for temperature, humidity, light,
-    soil moisture, and device status sensors. Uses proper Home Assistant
-    device classes and measurement units to enable automatic entity creation
-    and statistics tracking.
+    Creates the MQTT discovery configurations for temperature, humidity,
+    light, soil moisture, and device status sensors. Uses proper Home
+    Assistant device classes and measurement units to enable automatic
+    entity creation and statistics tracking. The payloads only depend on
+    configuration, so this runs once at import time.
 
     Returns:
-        None
+        list: (config_topic, json_payload) tuples, both as bytes
     """
-    global mqtt_client
-    if not is_mqtt_connected() or mqtt_client is None:
-        print("MQTT not connected, skipping discovery config")
-        return
-
     # Define sensors with proper Home Assistant device classes
     sensors = [
         {
@@ -302,9 +572,15 @@ def publish_discovery_config():
         },
     ]
 
+    payloads = []
     for sensor in sensors:
-        config_topic = f"homeassistant/sensor/pico_w_01/{sensor['id']}/config"
-        state_topic = f"homeassistant/sensor/pico_w_01/{sensor['id']}/state"
+        config_topic = _CONFIG_TOPICS[sensor["id"]]
+
+        # Measurement sensors read their value from the shared JSON state
+        if sensor.get("state_class"):
+            state_topic = _SENSOR_STATE_TOPIC
+        else:
+            state_topic = _TOPIC_BASE + sensor["id"] + "/state"
 
         config = {
             "name": sensor["name"],
@@ -331,32 +607,118 @@ def publish_discovery_config():
         # Add state_class for measurement sensors (enables statistics)
         if sensor.get("state_class"):
             config["state_class"] = sensor["state_class"]
+            # Readings can be missing from the JSON; an empty result makes
+            # Home Assistant keep the last value instead of logging an error
+            config["value_template"] = (
+                "{{ value_json.%s if value_json.%s is defined else '' }}"
+                % (sensor["id"], sensor["id"])
+            )
 
         # Only add icon for custom sensors without device_class
         if sensor.get("icon") and not sensor.get("device_class"):
             config["icon"] = sensor["icon"]
+
+        payloads.append((config_topic, json.dumps(config).encode("utf-8")))
+
+    return payloads
+
+
+_DISCOVERY_PAYLOADS = _build_discovery_payloads()
+
+
+def publish_discovery_config():
+    """
+    Publish Home Assistant discovery configurations for all sensors.
+
+    Publishes the pre-encoded payloads from _DISCOVERY_PAYLOADS with the
+    retain flag set, so Home Assistant picks them up after a restart.
+
+    Returns:
+        None
+    """
+    global mqtt_client
+    if not is_mqtt_connected() or mqtt_client is None:
+        if DEBUG:
+            print("MQTT not connected, skipping discovery config")
+        return
+
+    for config_topic, payload in _DISCOVERY_PAYLOADS:
         try:
-            if mqtt_client is not None:
-                mqtt_client.publish(
-                    config_topic, json.dumps(config).encode("utf-8"), retain=True
-                )
-                print(f"Discovery config published for {sensor['id']}")
-                time.sleep(0.2)  # Small delay between publishes
-            else:
-                print(
-                    f"Cannot publish discovery for {sensor['id']}: MQTT client is None"
-                )
+            mqtt_client.publish(config_topic, payload, retain=True)
+            if DEBUG:
+                print(f"Discovery config published to {config_topic}")
+            time.sleep_ms(200)  # Small delay between publishes
         except Exception as e:
-            print(f"Failed to publish discovery for {sensor['id']}: {e}")
+            if DEBUG:
+                print(f"Failed to publish discovery to {config_topic}: {e}")
+
+
+# Scratch buffer the sensor JSON payload is written into, reused every publish
+_payload_buf = bytearray(128)
+_payload_view = memoryview(_payload_buf)
+_SENSOR_JSON_KEYS = (
+    b'"temperature":',
+    b'"humidity":',
+    b'"lux":',
+    b'"soil_moisture":',
+)
+
+
+@micropython.native
+def _fmt_float_into(buf, pos, value):
+    """
+    Write a number as ASCII with two decimals into a buffer.
+
+    Formats the value digit by digit straight into buf so no intermediate
+    string is allocated on the heap.
+
+    Args:
+        buf (bytearray): Buffer to write into
+        pos (int): Index in buf to start writing at
+        value (float): Value to format
+
+    Returns:
+        int: Index in buf just past the written number
+    """
+    n = int(value * 100 + (0.5 if value >= 0 else -0.5))
+    if n < 0:
+        buf[pos] = 45  # "-"
+        pos += 1
+        n = -n
+    frac = n % 100
+    n //= 100
+
+    # Integer digits come out least significant first, so reverse them after
+    start = pos
+    while True:
+        buf[pos] = 48 + n % 10
+        pos += 1
+        n //= 10
+        if not n:
+            break
+    end = pos - 1
+    while start < end:
+        buf[start], buf[end] = buf[end], buf[start]
+        start += 1
+        end -= 1
+
+    buf[pos] = 46  # "."
+    buf[pos + 1] = 48 + frac // 10
+    buf[pos + 2] = 48 + frac % 10
+    return pos + 3
 
 
 def safe_publish(topic, value, retain=False):
     """
     Safely publish a value to an MQTT topic with error handling.
 
+    A failed publish never blocks to reconnect; it only marks MQTT as
+    disconnected so the main loop can reconnect with backoff.
+
     Args:
-        topic (str): MQTT topic to publish to
-        value: Value to publish (will be converted to string)
+        topic (bytes): MQTT topic to publish to
+        value: Value to publish; bytes-like values are sent as-is, anything
+            else is converted to string
         retain (bool): MQTT retain flag, default False
 
     Returns:
@@ -364,23 +726,31 @@ def safe_publish(topic, value, retain=False):
     """
     if not is_mqtt_connected():
         return False
+    if not isinstance(value, (bytes, bytearray, memoryview)):
+        value = str(value)
     try:
-        mqtt_client.publish(topic, str(value), retain=retain)
-        print(f"Published {value} to {topic} with retain={retain}")
+        mqtt_client.publish(topic, value, retain=retain)
+        connection_status["last_mqtt_send"] = time.ticks_ms()
         return True
     except Exception as e:
-        print(f"Publish failed to {topic}: {e}")
+        if DEBUG:
+            print(f"Publish failed to {topic}: {e}")
         connection_status["mqtt"] = False  # Mark as disconnected on failure
         return False
 
 
 def publish_sensor_data(temp, hum, lux, moisture):
     """
-    Publish all sensor data to individual MQTT topics.
+    Publish all sensor data as a single JSON message.
 
     Publishes temperature, humidity, light level, and soil moisture data
-    to separate MQTT topics using the safe_publish function. Counts
-    successful publications for monitoring purposes.
+    together to the shared sensor state topic using the safe_publish
+    function, so the radio wakes once per cycle instead of once per sensor.
+    Readings that are None are left out of the message. Home Assistant
+    extracts each value with the value_template set in discovery, which
+    keeps the previous state for any key that is missing. The JSON
+    is written into the reusable _payload_buf rather than built with
+    json.dumps, so publishing does not allocate payload strings.
 
     Args:
         temp (float): Temperature reading in Celsius
@@ -389,28 +759,38 @@ def publish_sensor_data(temp, hum, lux, moisture):
         moisture (float): Soil moisture reading in percentage
 
     Returns:
-        int: Number of successful sensor data publications
+        int: Number of sensor values successfully published
     """
     if not is_mqtt_connected():
-        print("MQTT not connected, skipping publish")
+        if DEBUG:
+            print("MQTT not connected, skipping publish")
         return 0
 
-    sensors_data = [
-        ("temperature", temp),
-        ("humidity", hum),
-        ("lux", lux),
-        ("soil_moisture", moisture),
-    ]
-
-    published_count = 0
-    for sensor_type, value in sensors_data:
-        if value is not None:
-            # Use consistent topic structure with discovery
-            topic = f"homeassistant/sensor/pico_w_01/{sensor_type}/state"
-            if safe_publish(topic, value, retain=True):
-                published_count += 1
+    values = (temp, hum, lux, moisture)
+    buf = _payload_buf
+    buf[0] = 123  # "{"
+    pos = 1
+    count = 0
+    for i in range(len(values)):
+        value = values[i]
+        if value is None:
+            continue
+        if count:
+            buf[pos] = 44  # ","
+            pos += 1
+        key = _SENSOR_JSON_KEYS[i]
+        buf[pos : pos + len(key)] = key
+        pos = _fmt_float_into(buf, pos + len(key), value)
+        count += 1
+
+    if not count:
+        return 0
+    buf[pos] = 125  # "}"
+    pos += 1
 
-    return published_count
+    if safe_publish(_STATE_TOPICS["sensors"], _payload_view[:pos], retain=True):
+        return count
+    return 0
 
 
 def publish_device_status():
@@ -425,7 +805,7 @@ def publish_device_status():
     Returns:
         bool: True if status published successfully, False otherwise
     """
-    topic = "homeassistant/sensor/pico_w_01/status/state"  # Updated to match discovery
+    topic = _STATE_TOPICS["status"]
 
     # Count working sensors
     working_sensors = sum(
@@ -444,6 +824,8 @@ def publish_device_status():
         ]
     )
 
+    last_publish = connection_status["last_successful_publish"]
+
     # Determine overall status
     if not connection_status["wifi"]:
         status = "WiFi Disconnected"
@@ -453,7 +835,10 @@ def publish_device_status():
         status = "All Sensors Failed"
     elif working_sensors < total_sensors:
         status = f"Partial ({working_sensors}/{total_sensors} sensors)"
-    elif time.time() - connection_status["last_successful_publish"] > 300:
+    elif (
+        last_publish is None
+        or time.ticks_diff(time.ticks_ms(), last_publish) > PUBLISH_TIMEOUT_MS
+    ):
         status = "Publish Timeout"
     else:
         status = "Online"
@@ -467,7 +852,10 @@ def update_oled(temp, hum, lux, moisture):
 
     Displays formatted sensor data on the SSD1306 OLED screen, showing
     light level, temperature, humidity, and soil moisture. Handles cases
-    where sensor values are None by displaying "--" placeholders.
+    where sensor values are None by displaying "--" placeholders. The
+    labels are copied from the prerendered _oled_template, so only the
+    values are drawn character by character. Skips the redraw and I2C
+    transfer entirely when the values have not changed since the last update.
 
     Args:
         temp (float): Temperature reading in Celsius
@@ -478,52 +866,55 @@ def update_oled(temp, hum, lux, moisture):
     Returns:
         None
     """
+    global _last_oled
     if oled is None:
         return
+    values = (temp, hum, lux, moisture)
+    if values == _last_oled:
+        return
     try:
-        oled.fill(0)
-        oled.text("Lux: {:.1f}".format(lux) if lux is not None else "Lux: --", 0, 0)
-        oled.text(
-            "Temp: {:.1f}C".format(temp) if temp is not None else "Temp: --", 0, 16
-        )
-        oled.text(
-            "Humidity: {:.1f}%".format(hum) if hum is not None else "Humidity: --",
-            0,
-            32,
-        )
-        oled.text(
-            (
-                "Moisture: {:.1f}%".format(moisture)
-                if moisture is not None
-                else "Moisture: --"
-            ),
-            0,
-            48,
+        texts = (
+            "%.1f" % lux if lux is not None else "--",
+            "%.1fC" % temp if temp is not None else "--",
+            "%.1f%%" % hum if hum is not None else "--",
+            "%.1f%%" % moisture if moisture is not None else "--",
         )
+        oled.buffer[:] = _oled_template
+        for i in range(len(texts)):
+            label, y = _OLED_LABELS[i]
+            oled.text(texts[i], len(label) * 8, y)
         oled.show()
+        _last_oled = values
     except Exception as e:
-        print("OLED update failed:", e)
+        if DEBUG:
+            print("OLED update failed:", e)
 
 
-def get_soil_moisture_percent(raw_value, dry=SOIL_MOISTURE_DRY, wet=SOIL_MOISTURE_WET):
+SOIL_MOISTURE_RANGE = SOIL_MOISTURE_DRY - SOIL_MOISTURE_WET
+
+
+@micropython.native
+def get_soil_moisture_percent(raw_value):
     """
     Convert raw ADC soil moisture reading to percentage.
 
     Converts raw 16-bit ADC values from capacitive soil moisture sensor
-    to percentage values using calibrated dry and wet reference points.
-    Higher ADC values indicate drier soil, lower values indicate wetter soil.
+    to percentage values using the calibrated SOIL_MOISTURE_DRY and
+    SOIL_MOISTURE_WET reference points from config.py. Higher ADC values
+    indicate drier soil, lower values indicate wetter soil. Uses integer
+    arithmetic only, with early returns instead of a min/max clamp.
 
     Args:
         raw_value (int): Raw ADC reading from soil moisture sensor
-        dry (int): ADC value for completely dry soil (default: 41000)
-        wet (int): ADC value for completely wet soil (default: 18000)
 
     Returns:
         int: Soil moisture percentage (0-100)
     """
-    raw_value = max(min(raw_value, dry), wet)
-    percent = int((dry - raw_value) * 100 / (dry - wet))
-    return percent
+    if raw_value >= SOIL_MOISTURE_DRY:
+        return 0
+    if raw_value <= SOIL_MOISTURE_WET:
+        return 100
+    return (SOIL_MOISTURE_DRY - raw_value) * 100 // SOIL_MOISTURE_RANGE
 
 
 def safe_sensor_read(sensor_name, read_function):
@@ -547,25 +938,73 @@ def safe_sensor_read(sensor_name, read_function):
         return result
     except Exception as e:
         failed_sensor_reads[sensor_name] += 1
-        if failed_sensor_reads[sensor_name] >= 5:
+        if DEBUG and failed_sensor_reads[sensor_name] >= 5:
             print(
                 f"{sensor_name} sensor failed {failed_sensor_reads[sensor_name]} times: {e}"
             )
         return None
 
 
+def is_stable(value, last, noise_floor):
+    """
+    Check whether a reading is within the noise floor of the previous one.
+
+    Args:
+        value (float): New reading, or None if the read failed
+        last (float): Previous reading, or None if there is none
+        noise_floor (float): Largest change still considered noise
+
+    Returns:
+        bool: True if both readings exist and differ by less than noise_floor
+    """
+    return value is not None and last is not None and abs(value - last) < noise_floor
+
+
+def schedule_next_read(sensor_name, stable, now_ms):
+    """
+    Adapt how often a sensor is read based on whether its value is changing.
+
+    Each stable reading doubles the sensor's read interval, starting from
+    SENSOR_READ_INTERVAL and capped at ADAPTIVE_MAX_INTERVAL_MS. Any
+    meaningful change resets it to every main loop sensor read.
+
+    Args:
+        sensor_name (str): Sensor name as used in _stable_count
+        stable (bool): Whether the latest reading was within the noise floor
+        now_ms (int): Current time from time.ticks_ms()
+
+    Returns:
+        None
+    """
+    if not stable:
+        _stable_count[sensor_name] = 0
+        _skip_until_ms[sensor_name] = now_ms
+        return
+
+    interval = SENSOR_READ_INTERVAL_MS << (_stable_count[sensor_name] + 1)
+    if interval < ADAPTIVE_MAX_INTERVAL_MS:
+        _stable_count[sensor_name] += 1
+    else:
+        interval = ADAPTIVE_MAX_INTERVAL_MS
+    _skip_until_ms[sensor_name] = time.ticks_add(now_ms, interval)
+
+
 def read_sensors_once():
     """
-    Read all sensors once and return their values.
+    Read all sensors that are due and return their values.
 
     Performs a single reading from all connected sensors (DHT11, BH1750,
     soil moisture) using safe_sensor_read for error handling. Converts
     raw soil moisture ADC values to percentage using calibrated reference points.
+    Sensors whose readings have stayed within their noise floor are read
+    less often (see schedule_next_read); a skipped sensor returns None.
 
     Returns:
         tuple: (temperature, humidity, lux, moisture_percent) - any value
-               can be None if sensor reading failed
+               can be None if sensor reading failed or was skipped
     """
+    now_ms = time.ticks_ms()
+    temp = hum = lux = moisture = None
 
     # DHT11 reading
     def read_dht():
@@ -574,42 +1013,115 @@ def read_sensors_once():
         dht_sensor.measure()
         return dht_sensor.temperature(), dht_sensor.humidity()
 
-    temp, hum = safe_sensor_read("dht11", read_dht) or (None, None)
+    if time.ticks_diff(now_ms, _skip_until_ms["dht11"]) >= 0:
+        temp, hum = safe_sensor_read("dht11", read_dht) or (None, None)
+        schedule_next_read(
+            "dht11",
+            is_stable(temp, _last_reading["temperature"], NOISE_FLOOR_TEMPERATURE)
+            and is_stable(hum, _last_reading["humidity"], NOISE_FLOOR_HUMIDITY),
+            now_ms,
+        )
+        _last_reading["temperature"] = temp
+        _last_reading["humidity"] = hum
 
     # Light sensor reading
-    lux = safe_sensor_read(
-        "bh1750",
-        lambda: light_sensor.luminance(BH1750.ONCE_HIRES_1) if light_sensor else None,
-    )
+    if time.ticks_diff(now_ms, _skip_until_ms["bh1750"]) >= 0:
+        lux = safe_sensor_read(
+            "bh1750",
+            lambda: (
+                light_sensor.luminance(light_sensor.ONCE_HIRES_1)
+                if light_sensor
+                else None
+            ),
+        )
+        schedule_next_read(
+            "bh1750", is_stable(lux, _last_reading["lux"], NOISE_FLOOR_LUX), now_ms
+        )
+        _last_reading["lux"] = lux
 
     # Soil moisture reading
-    moisture_raw = safe_sensor_read(
-        "soil_moisture",
-        lambda: soil_moisture_adc.read_u16() if soil_moisture_adc else None,
-    )
-    moisture = (
-        get_soil_moisture_percent(moisture_raw) if moisture_raw is not None else None
-    )
+    if time.ticks_diff(now_ms, _skip_until_ms["soil_moisture"]) >= 0:
+        moisture_raw = safe_sensor_read(
+            "soil_moisture",
+            lambda: soil_moisture_adc.read_u16() if soil_moisture_adc else None,
+        )
+        moisture = (
+            get_soil_moisture_percent(moisture_raw)
+            if moisture_raw is not None
+            else None
+        )
+        schedule_next_read(
+            "soil_moisture",
+            is_stable(
+                moisture, _last_reading["soil_moisture"], NOISE_FLOOR_SOIL_MOISTURE
+            ),
+            now_ms,
+        )
+        _last_reading["soil_moisture"] = moisture
 
     return temp, hum, lux, moisture
 
 
-# Initialize everything
-print("Initializing sensors...")
-initialize_sensors()
+def run_init_steps(steps):
+    """
+    Run initialization steps in dependency order.
+
+    Resolves the steps with Kahn's algorithm: each pass runs every step
+    whose dependencies have all finished, keeping declaration order within
+    a pass. A step that returns False counts as failed, and steps depending
+    on it are skipped, but unrelated steps still run.
+
+    Args:
+        steps (list): (name, dependencies, function) tuples
 
-print("All sensors initialized, starting connection setup...")
+    Returns:
+        dict: Step name mapped to True if it succeeded, False otherwise
 
-# Connect to WiFi and MQTT
-if not connect_wifi():
-    print("Initial WiFi connection failed, continuing and will retry in loop")
+    Raises:
+        ValueError: If a dependency is unknown or the steps form a cycle
+    """
+    results = {}
+    pending = steps
+    while pending:
+        remaining = []
+        for step in pending:
+            name, deps, func = step
+            if not all(dep in results for dep in deps):
+                remaining.append(step)
+            elif all(results[dep] for dep in deps):
+                results[name] = func() is not False
+                if DEBUG and not results[name]:
+                    print(f"Init step {name} failed")
+            else:
+                results[name] = False
+                if DEBUG:
+                    print(f"Skipping init step {name}: a dependency failed")
+        if len(remaining) == len(pending):
+            raise ValueError(
+                "Unresolvable init steps: %s" % ", ".join(s[0] for s in remaining)
+            )
+        pending = remaining
+    return results
+
+
+# Initialization steps as (name, dependencies, function); new hardware only
+# needs an entry here
+_INIT_STEPS = [
+    ("i2c", (), init_i2c),
+    ("oled", ("i2c",), init_oled),
+    ("bh1750", ("i2c",), init_bh1750),
+    ("dht11", (), init_dht11),
+    ("soil_moisture", (), init_soil_moisture),
+    ("wifi", (), connect_wifi),
+    ("mqtt", ("wifi",), connect_mqtt),
+    ("discovery", ("mqtt",), publish_discovery_config),
+    ("status", ("discovery",), publish_device_status),
+]
 
-if not connect_mqtt():
-    print("Initial MQTT connection failed, will retry in loop")
-else:
-    time.sleep(1)
-    publish_discovery_config()
-    publish_device_status()
+# Initialize everything
+if DEBUG:
+    print("Initializing...")
+run_init_steps(_INIT_STEPS)
 
 
 # Add this function after your other functions
@@ -627,66 +1139,103 @@ def force_gc():
     gc.collect()
     free_mem = gc.mem_free()
     alloc_mem = gc.mem_alloc()
-    print(f"Memory - Free: {free_mem}, Allocated: {alloc_mem}")
-    if free_mem < 10000:  # Less than 10KB free
+    if DEBUG:
+        print(f"Memory - Free: {free_mem}, Allocated: {alloc_mem}")
+    if DEBUG and free_mem < 10000:  # Less than 10KB free
         print("WARNING: Low memory!")
 
 
-# Main loop with averaging
-last_publish_time = 0
-last_sensor_read_time = 0
-last_connection_check = 0
-last_status_update = 0
-last_gc_time = 0  # Add this for better GC timing
-
-# Lists to store readings for averaging
-temp_readings = []
-hum_readings = []
-lux_readings = []
-moisture_readings = []
-
-print("Starting sensor loop...")
+# Main loop with averaging. Timestamps are time.ticks_ms() values, which stay
+# small ints and wrap safely with ticks_diff(). Each one starts a full interval
+# in the past so every task runs on the first iteration.
+now_ms = time.ticks_ms()
+last_publish_time = time.ticks_add(now_ms, -PUBLISH_INTERVAL_MS)
+last_sensor_read_time = time.ticks_add(now_ms, -SENSOR_READ_INTERVAL_MS)
+last_connection_check = time.ticks_add(now_ms, -CONNECTION_CHECK_INTERVAL_MS)
+last_status_update = time.ticks_add(now_ms, -STATUS_UPDATE_INTERVAL_MS)
+last_gc_time = time.ticks_add(now_ms, -GC_INTERVAL_MS)
+
+# Running sums and counts for averaging. Sums start as ints: DHT11 and soil
+# moisture readings are ints, so their sums stay small ints and never allocate
+# a boxed float per sample
+temp_sum = 0
+temp_n = 0
+hum_sum = 0
+hum_n = 0
+lux_sum = 0
+lux_n = 0
+moisture_sum = 0
+moisture_n = 0
+
+if DEBUG:
+    print("Starting sensor loop...")
 
 while True:
-    current_time = time.time()
+    now_ms = time.ticks_ms()
 
     # MQTT keepalive - call this frequently to maintain connection
     if is_mqtt_connected() and mqtt_client is not None:
         try:
             mqtt_client.check_msg()  # This maintains the keepalive
         except Exception as e:
-            print(f"MQTT check_msg failed: {e}")
+            if DEBUG:
+                print(f"MQTT check_msg failed: {e}")
             connection_status["mqtt"] = False
 
     # Force garbage collection every 5 minutes
-    if current_time - last_gc_time >= 300:  # Every 5 minutes
+    if time.ticks_diff(now_ms, last_gc_time) >= GC_INTERVAL_MS:
         force_gc()
-        last_gc_time = current_time
-
-    # Check connections every 60 seconds
-    if current_time - last_connection_check >= 60:
+        last_gc_time = now_ms
+
+    # Check connections every 60 seconds, or sooner when a backoff window expires
+    reconnect_due = (
+        not connection_status["wifi"] and backoff_ready(_wifi_backoff)
+    ) or (
+        connection_status["wifi"]
+        and not connection_status["mqtt"]
+        and backoff_ready(_mqtt_backoff)
+    )
+    if (
+        time.ticks_diff(now_ms, last_connection_check) >= CONNECTION_CHECK_INTERVAL_MS
+        or reconnect_due
+    ):
         wifi_was_connected = connection_status["wifi"]
         mqtt_was_connected = connection_status["mqtt"]
 
         if wlan is None or not wlan.isconnected():
-            print("WiFi disconnected, attempting to reconnect...")
-            connect_wifi()
+            connection_status["wifi"] = False
+            if backoff_ready(_wifi_backoff):
+                if DEBUG:
+                    print("WiFi disconnected, attempting to reconnect...")
+                connect_wifi()
         else:
             connection_status["wifi"] = True
 
-        if mqtt_client is not None:
-            try:
-                mqtt_client.ping()
-                connection_status["mqtt"] = True
-            except:
-                print("MQTT ping failed, attempting to reconnect...")
-                connection_status["mqtt"] = False
-                connect_mqtt()
-                if is_mqtt_connected():
-                    publish_discovery_config()
-                    publish_device_status()
-        else:
+        if mqtt_client is None:
             connection_status["mqtt"] = False
+        elif not connection_status["mqtt"]:
+            # Already known dead (failed send or reconnect), skip straight
+            # to the backoff-gated reconnect below
+            pass
+        elif (
+            time.ticks_diff(now_ms, connection_status["last_mqtt_send"])
+            < MQTT_IDLE_PING_AFTER_MS
+        ):
+            # Recent traffic already satisfies the broker keepalive
+            pass
+        else:
+            connection_status["mqtt"] = ping_mqtt()
+
+        if (
+            not connection_status["mqtt"]
+            and connection_status["wifi"]
+            and backoff_ready(_mqtt_backoff)
+        ):
+            if DEBUG:
+                print("Attempting MQTT reconnect...")
+            if reconnect_mqtt():
+                publish_discovery_config()
+                publish_device_status()
 
         # Publish status update if connection state changed
         if (
@@ -695,64 +1244,85 @@ while True:
         ):
             publish_device_status()
 
-        last_connection_check = current_time
+        last_connection_check = now_ms
 
     # Publish status update periodically
-    if current_time - last_status_update >= STATUS_UPDATE_INTERVAL:
+    if time.ticks_diff(now_ms, last_status_update) >= STATUS_UPDATE_INTERVAL_MS:
         publish_device_status()
-        last_status_update = current_time
+        last_status_update = now_ms
 
     # Read sensors every SENSOR_READ_INTERVAL seconds
-    if current_time - last_sensor_read_time >= SENSOR_READ_INTERVAL:
+    if time.ticks_diff(now_ms, last_sensor_read_time) >= SENSOR_READ_INTERVAL_MS:
         temp, hum, lux, moisture = read_sensors_once()
 
-        # Store valid readings
+        # Accumulate valid readings
         if temp is not None:
-            temp_readings.append(temp)
+            temp_sum += temp
+            temp_n += 1
         if hum is not None:
-            hum_readings.append(hum)
+            hum_sum += hum
+            hum_n += 1
         if lux is not None:
-            lux_readings.append(lux)
+            lux_sum += lux
+            lux_n += 1
         if moisture is not None:
-            moisture_readings.append(moisture)
+            moisture_sum += moisture
+            moisture_n += 1
 
-        last_sensor_read_time = current_time
+        last_sensor_read_time = now_ms
 
     # Publish averaged values every PUBLISH_INTERVAL seconds
-    if current_time - last_publish_time >= PUBLISH_INTERVAL:
+    if time.ticks_diff(now_ms, last_publish_time) >= PUBLISH_INTERVAL_MS:
         # Calculate averages
-        avg_temp = sum(temp_readings) / len(temp_readings) if temp_readings else None
-        avg_hum = sum(hum_readings) / len(hum_readings) if hum_readings else None
-        avg_lux = sum(lux_readings) / len(lux_readings) if lux_readings else None
-        avg_moisture = (
-            sum(moisture_readings) / len(moisture_readings)
-            if moisture_readings
-            else None
-        )
+        avg_temp = temp_sum / temp_n if temp_n else None
+        avg_hum = hum_sum / hum_n if hum_n else None
+        avg_lux = lux_sum / lux_n if lux_n else None
+        avg_moisture = moisture_sum / moisture_n if moisture_n else None
 
         update_oled(avg_temp, avg_hum, avg_lux, avg_moisture)
-        print(
-            f"Calculated averages -> Temp: {avg_temp}, Hum: {avg_hum}, Lux: {avg_lux}, Moisture: {avg_moisture}"
-        )
+        if DEBUG:
+            print(
+                f"Calculated averages -> Temp: {avg_temp}, Hum: {avg_hum}, Lux: {avg_lux}, Moisture: {avg_moisture}"
+            )
 
         # Publish data
         published_count = publish_sensor_data(avg_temp, avg_hum, avg_lux, avg_moisture)
 
         if published_count > 0:
-            connection_status["last_successful_publish"] = current_time
-            print(f"Successfully published {published_count}/4 sensor values")
-        else:
+            connection_status["last_successful_publish"] = now_ms
+            if DEBUG:
+                print(f"Successfully published {published_count}/4 sensor values")
+        elif DEBUG:
             print("MQTT not connected, skipping publish")
 
-        # Clear readings for next averaging period
-        for readings_list in [
-            temp_readings,
-            hum_readings,
-            lux_readings,
-            moisture_readings,
-        ]:
-            readings_list.clear()
+        # Reset accumulators for next averaging period
+        temp_sum = hum_sum = lux_sum = moisture_sum = 0
+        temp_n = hum_n = lux_n = moisture_n = 0
+
+        last_publish_time = now_ms
 
-        last_publish_time = current_time
+    # Sleep until the next scheduled task instead of polling every 0.5s
+    now_ms = time.ticks_ms()
+    sleep_ms = min(
+        SENSOR_READ_INTERVAL_MS - time.ticks_diff(now_ms, last_sensor_read_time),
+        PUBLISH_INTERVAL_MS - time.ticks_diff(now_ms, last_publish_time),
+        CONNECTION_CHECK_INTERVAL_MS - time.ticks_diff(now_ms, last_connection_check),
+        STATUS_UPDATE_INTERVAL_MS - time.ticks_diff(now_ms, last_status_update),
+        GC_INTERVAL_MS - time.ticks_diff(now_ms, last_gc_time),
+    )
+    if not connection_status["wifi"] and _wifi_backoff["attempts"]:
+        sleep_ms = min(
+            sleep_ms, time.ticks_diff(_wifi_backoff["next_attempt_ms"], now_ms)
+        )
+    elif not connection_status["mqtt"] and _mqtt_backoff["attempts"]:
+        sleep_ms = min(
+            sleep_ms, time.ticks_diff(_mqtt_backoff["next_attempt_ms"], now_ms)
+        )
 
-    time.sleep(0.5)
+    sleep_ms = max(sleep_ms, MIN_SLEEP_MS)
+    if sleep_ms >= LIGHTSLEEP_MIN_MS:
+        # The MQTT socket is not serviced during light sleep, so only use it
+        # for long waits; all deadlines are well inside the broker keepalive
+        lightsleep(sleep_ms)
+    else:
+        time.sleep_ms(sleep_ms)